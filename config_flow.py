@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import contextlib
+import json
 import logging
 from typing import Any, Final, cast
 
@@ -44,7 +45,11 @@ from .discovery import (
     async_populate_data_from_discovery,
     async_update_entry_from_discovery,
 )
-from .util import format_as_flux_mac
+from .util import (
+    CUSTOM_EFFECT_COLORS_EXCEPTIONS,
+    _parse_custom_effect_colors,
+    format_as_flux_mac,
+)
 
 CONF_DEVICE: Final = "device"
 _LOGGER = logging.getLogger(__name__)
@@ -269,6 +274,13 @@ class OptionsFlow(config_entries.OptionsFlow):
         """Configure the options."""
         errors: dict[str, str] = {}
         if user_input is not None:
+            if raw_colors := user_input.get(CONF_CUSTOM_EFFECT_COLORS):
+                # Store valid colors as JSON, invalid ones are
+                # reported when the light is set up
+                with contextlib.suppress(*CUSTOM_EFFECT_COLORS_EXCEPTIONS):
+                    user_input[CONF_CUSTOM_EFFECT_COLORS] = json.dumps(
+                        _parse_custom_effect_colors(raw_colors)
+                    )
             return self.async_create_entry(title="", data=user_input)
 
         options = self._config_entry.options
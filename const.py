@@ -30,7 +30,7 @@ FLUX_COLOR_MODE_TO_HASS: Final = {
     FLUX_COLOR_MODE_CCT: COLOR_MODE_COLOR_TEMP,
 }
 
-MULTI_BRIGHTNESS_COLOR_MODES: Final = {COLOR_MODE_RGBWW, COLOR_MODE_RGBW}
+MULTI_BRIGHTNESS_COLOR_MODES: Final = frozenset({COLOR_MODE_RGBWW, COLOR_MODE_RGBW})
 
 API: Final = "flux_api"
 
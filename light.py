@@ -1,7 +1,8 @@
 """Support for Magic Home lights."""
 from __future__ import annotations
 
-import ast
+from collections.abc import Awaitable, Callable
+import json
 import logging
 from typing import Any, Final
 
@@ -54,25 +55,29 @@ from .const import (
 from .coordinator import FluxLedUpdateCoordinator
 from .entity import FluxOnOffEntity
 from .util import (
+    CUSTOM_EFFECT_COLORS_EXCEPTIONS,
     _effect_brightness,
     _flux_color_mode_to_hass,
     _hass_color_modes,
     _min_rgb_brightness,
     _min_rgbw_brightness,
     _min_rgbwc_brightness,
+    _parse_custom_effect_colors,
     _str_to_multi_color_effect,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-MODE_ATTRS = {
-    ATTR_EFFECT,
-    ATTR_COLOR_TEMP,
-    ATTR_RGB_COLOR,
-    ATTR_RGBW_COLOR,
-    ATTR_RGBWW_COLOR,
-    ATTR_WHITE,
-}
+MODE_ATTRS = frozenset(
+    {
+        ATTR_EFFECT,
+        ATTR_COLOR_TEMP,
+        ATTR_RGB_COLOR,
+        ATTR_RGBW_COLOR,
+        ATTR_RGBWW_COLOR,
+        ATTR_WHITE,
+    }
+)
 
 ATTR_FOREGROUND_COLOR: Final = "foreground_color"
 ATTR_BACKGROUND_COLOR: Final = "background_color"
@@ -137,6 +142,28 @@ SET_ZONES_DICT: Final = {
 }
 
 
+@callback
+def _async_load_custom_effect_colors(
+    hass: HomeAssistant, entry: config_entries.ConfigEntry
+) -> list[tuple[int, int, int]]:
+    """Load the custom effect colors from the entry options."""
+    options = entry.options
+    raw_colors = options.get(CONF_CUSTOM_EFFECT_COLORS) or "[]"
+    try:
+        custom_effect_colors = _parse_custom_effect_colors(raw_colors)
+    except CUSTOM_EFFECT_COLORS_EXCEPTIONS as ex:
+        _LOGGER.warning(
+            "Could not parse custom effect colors for %s: %s", entry.unique_id, ex
+        )
+        return []
+    if (json_colors := json.dumps(custom_effect_colors)) != raw_colors:
+        # Options saved before the colors were stored as JSON
+        hass.config_entries.async_update_entry(
+            entry, options={**options, CONF_CUSTOM_EFFECT_COLORS: json_colors}
+        )
+    return custom_effect_colors
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: config_entries.ConfigEntry,
@@ -162,16 +189,7 @@ async def async_setup_entry(
         "async_set_music_mode",
     )
     options = entry.options
-
-    try:
-        custom_effect_colors = ast.literal_eval(
-            options.get(CONF_CUSTOM_EFFECT_COLORS) or "[]"
-        )
-    except (ValueError, TypeError, SyntaxError, MemoryError) as ex:
-        _LOGGER.warning(
-            "Could not parse custom effect colors for %s: %s", entry.unique_id, ex
-        )
-        custom_effect_colors = []
+    custom_effect_colors = _async_load_custom_effect_colors(hass, entry)
 
     async_add_entities(
         [
@@ -179,7 +197,7 @@ async def async_setup_entry(
                 coordinator,
                 entry.unique_id or entry.entry_id,
                 entry.data.get(CONF_NAME, entry.title),
-                list(custom_effect_colors),
+                custom_effect_colors,
                 options.get(CONF_CUSTOM_EFFECT_SPEED_PCT, DEFAULT_EFFECT_SPEED),
                 options.get(CONF_CUSTOM_EFFECT_TRANSITION, TRANSITION_GRADUAL),
             )
@@ -205,11 +223,13 @@ class FluxLight(FluxOnOffEntity, CoordinatorEntity, LightEntity):
         super().__init__(coordinator, base_unique_id, name, None)
         self._attr_min_mireds = color_temperature_kelvin_to_mired(self._device.max_temp)
         self._attr_max_mireds = color_temperature_kelvin_to_mired(self._device.min_temp)
+        # The color modes a device supports are fixed once it has been set up
+        self._flux_color_modes = self._device.color_modes
         self._attr_supported_color_modes = _hass_color_modes(self._device)
-        custom_effects: list[str] = []
+        effect_list = self._device.effect_list
         if custom_effect_colors:
-            custom_effects.append(EFFECT_CUSTOM)
-        self._attr_effect_list = [*self._device.effect_list, *custom_effects]
+            effect_list = [*effect_list, EFFECT_CUSTOM]
+        self._attr_effect_list = effect_list
         self._custom_effect_colors = custom_effect_colors
         self._custom_effect_speed_pct = custom_effect_speed_pct
         self._custom_effect_transition = custom_effect_transition
@@ -222,7 +242,11 @@ class FluxLight(FluxOnOffEntity, CoordinatorEntity, LightEntity):
     @property
     def color_temp(self) -> int:
         """Return the kelvin value of this light in mired."""
-        return color_temperature_kelvin_to_mired(self._device.color_temp)
+        # Same as color_temperature_kelvin_to_mired for the integer
+        # kelvin values the device reports, without the extra call
+        if color_temp := self._device.color_temp:
+            return 1_000_000 // color_temp
+        return 0
 
     @property
     def rgb_color(self) -> tuple[int, int, int]:
@@ -242,9 +266,7 @@ class FluxLight(FluxOnOffEntity, CoordinatorEntity, LightEntity):
     @property
     def color_mode(self) -> str:
         """Return the color mode of the light."""
-        return _flux_color_mode_to_hass(
-            self._device.color_mode, self._device.color_modes
-        )
+        return _flux_color_mode_to_hass(self._device.color_mode, self._flux_color_modes)
 
     @property
     def effect(self) -> str | None:
@@ -253,33 +275,17 @@ class FluxLight(FluxOnOffEntity, CoordinatorEntity, LightEntity):
 
     async def _async_turn_on(self, **kwargs: Any) -> None:
         """Turn the specified or all lights on."""
-        if self._device.requires_turn_on or not kwargs:
-            if not self.is_on:
-                await self._device.async_turn_on()
-            if not kwargs:
-                return
+        device = self._device
+        if not kwargs:
+            if not device.is_on:
+                await device.async_turn_on()
+            return
+        await self._async_ensure_device_on()
 
         if MODE_ATTRS.intersection(kwargs):
             await self._async_set_mode(**kwargs)
             return
-        await self._device.async_set_brightness(self._async_brightness(**kwargs))
-
-    async def _async_set_effect(self, effect: str, brightness: int) -> None:
-        """Set an effect."""
-        # Custom effect
-        if effect == EFFECT_CUSTOM:
-            if self._custom_effect_colors:
-                await self._device.async_set_custom_pattern(
-                    self._custom_effect_colors,
-                    self._custom_effect_speed_pct,
-                    self._custom_effect_transition,
-                )
-            return
-        await self._device.async_set_effect(
-            effect,
-            self._device.speed or DEFAULT_EFFECT_SPEED,
-            _effect_brightness(brightness),
-        )
+        await device.async_set_brightness(self._async_brightness(**kwargs))
 
     @callback
     def _async_brightness(self, **kwargs: Any) -> int:
@@ -296,49 +302,97 @@ class FluxLight(FluxOnOffEntity, CoordinatorEntity, LightEntity):
 
     async def _async_set_mode(self, **kwargs: Any) -> None:
         """Set an effect or color mode."""
-        brightness = self._async_brightness(**kwargs)
-        # Handle switch to Effect Mode
-        if effect := kwargs.get(ATTR_EFFECT):
-            await self._async_set_effect(effect, brightness)
-            return
-        # Handle switch to CCT Color Mode
-        if color_temp_mired := kwargs.get(ATTR_COLOR_TEMP):
-            color_temp_kelvin = color_temperature_mired_to_kelvin(color_temp_mired)
-            if (
-                ATTR_BRIGHTNESS not in kwargs
-                and self.color_mode in MULTI_BRIGHTNESS_COLOR_MODES
-            ):
-                # When switching to color temp from RGBWW or RGB&W mode,
-                # we do not want the overall brightness of the RGB channels
-                brightness = max(MIN_CCT_BRIGHTNESS, *self._device.rgb)
-            await self._device.async_set_white_temp(color_temp_kelvin, brightness)
-            return
-        # Handle switch to RGB Color Mode
-        if rgb := kwargs.get(ATTR_RGB_COLOR):
-            if not self._device.requires_turn_on:
-                rgb = _min_rgb_brightness(rgb)
-            red, green, blue = rgb
-            await self._device.async_set_levels(red, green, blue, brightness=brightness)
-            return
-        # Handle switch to RGBW Color Mode
-        if rgbw := kwargs.get(ATTR_RGBW_COLOR):
-            if ATTR_BRIGHTNESS in kwargs:
-                rgbw = rgbw_brightness(rgbw, brightness)
-            rgbw = _min_rgbw_brightness(rgbw, self._device.rgbw)
-            await self._device.async_set_levels(*rgbw)
-            return
-        # Handle switch to RGBWW Color Mode
-        if rgbcw := kwargs.get(ATTR_RGBWW_COLOR):
-            if ATTR_BRIGHTNESS in kwargs:
-                rgbcw = rgbcw_brightness(kwargs[ATTR_RGBWW_COLOR], brightness)
-            rgbwc = rgbcw_to_rgbwc(rgbcw)
-            rgbwc = _min_rgbwc_brightness(rgbwc, self._device.rgbww)
-            await self._device.async_set_levels(*rgbwc)
-            return
+        # The first mode attribute set, in priority order, wins
+        for attr, handler in self._MODE_HANDLERS:
+            if value := kwargs.get(attr):
+                await handler(self, value, kwargs)
+                return
         if (white := kwargs.get(ATTR_WHITE)) is not None:
             await self._device.async_set_levels(w=white)
             return
 
+    async def _async_set_effect(self, effect: str, kwargs: dict[str, Any]) -> None:
+        """Switch to Effect Mode."""
+        device = self._device
+        # Custom effect
+        if effect == EFFECT_CUSTOM:
+            if self._custom_effect_colors:
+                await device.async_set_custom_pattern(
+                    self._custom_effect_colors,
+                    self._custom_effect_speed_pct,
+                    self._custom_effect_transition,
+                )
+            return
+        await device.async_set_effect(
+            effect,
+            device.speed or DEFAULT_EFFECT_SPEED,
+            _effect_brightness(self._async_brightness(**kwargs)),
+        )
+
+    async def _async_set_color_temp(
+        self, color_temp_mired: int, kwargs: dict[str, Any]
+    ) -> None:
+        """Switch to CCT Color Mode."""
+        device = self._device
+        color_temp_kelvin = color_temperature_mired_to_kelvin(color_temp_mired)
+        if (
+            ATTR_BRIGHTNESS not in kwargs
+            and self.color_mode in MULTI_BRIGHTNESS_COLOR_MODES
+        ):
+            # When switching to color temp from RGBWW or RGB&W mode,
+            # we do not want the overall brightness of the RGB channels
+            brightness = max(MIN_CCT_BRIGHTNESS, *device.rgb)
+        else:
+            brightness = self._async_brightness(**kwargs)
+        await device.async_set_white_temp(color_temp_kelvin, brightness)
+
+    async def _async_set_rgb(
+        self, rgb: tuple[int, int, int], kwargs: dict[str, Any]
+    ) -> None:
+        """Switch to RGB Color Mode."""
+        device = self._device
+        if not device.requires_turn_on:
+            rgb = _min_rgb_brightness(rgb)
+        red, green, blue = rgb
+        await device.async_set_levels(
+            red, green, blue, brightness=self._async_brightness(**kwargs)
+        )
+
+    async def _async_set_rgbw(
+        self, rgbw: tuple[int, int, int, int], kwargs: dict[str, Any]
+    ) -> None:
+        """Switch to RGBW Color Mode."""
+        if ATTR_BRIGHTNESS in kwargs:
+            rgbw = rgbw_brightness(rgbw, self._async_brightness(**kwargs))
+        rgbw = _min_rgbw_brightness(rgbw, self._device.rgbw)
+        await self._device.async_set_levels(*rgbw)
+
+    async def _async_set_rgbww(
+        self, rgbcw: tuple[int, int, int, int, int], kwargs: dict[str, Any]
+    ) -> None:
+        """Switch to RGBWW Color Mode."""
+        if ATTR_BRIGHTNESS in kwargs:
+            rgbcw = rgbcw_brightness(rgbcw, self._async_brightness(**kwargs))
+        rgbwc = rgbcw_to_rgbwc(rgbcw)
+        rgbwc = _min_rgbwc_brightness(rgbwc, self._device.rgbww)
+        await self._device.async_set_levels(*rgbwc)
+
+    # Mode attributes in the order they take priority and
+    # the handler that applies each one; white is handled
+    # separately since 0 is a valid value
+    _MODE_HANDLERS: Final[
+        tuple[
+            tuple[str, Callable[[FluxLight, Any, dict[str, Any]], Awaitable[None]]],
+            ...,
+        ]
+    ] = (
+        (ATTR_EFFECT, _async_set_effect),
+        (ATTR_COLOR_TEMP, _async_set_color_temp),
+        (ATTR_RGB_COLOR, _async_set_rgb),
+        (ATTR_RGBW_COLOR, _async_set_rgbw),
+        (ATTR_RGBWW_COLOR, _async_set_rgbww),
+    )
+
     async def async_set_custom_effect(
         self, colors: list[tuple[int, int, int]], speed_pct: int, transition: str
     ) -> None:
@@ -3,7 +3,6 @@ from __future__ import annotations
 
 from abc import abstractmethod
 import logging
-from typing import cast
 
 from flux_led.protocol import (
     MUSIC_PIXELS_MAX,
@@ -104,7 +103,7 @@ class FluxSpeedNumber(FluxEntity, CoordinatorEntity, NumberEntity):
     @property
     def value(self) -> float:
         """Return the effect speed."""
-        return cast(float, self._device.speed)
+        return self._device.speed
 
     async def async_set_value(self, value: float) -> None:
         """Set the flux speed value."""
@@ -1,6 +1,10 @@
 """Utils for Magic Home."""
 from __future__ import annotations
 
+import ast
+import json
+from typing import Final
+
 from flux_led.aio import AIOWifiLedBulb
 from flux_led.const import COLOR_MODE_DIM as FLUX_COLOR_MODE_DIM, MultiColorEffects
 
@@ -13,6 +17,16 @@ from homeassistant.util.color import color_hsv_to_RGB, color_RGB_to_hsv
 
 from .const import FLUX_COLOR_MODE_TO_HASS, MIN_RGB_BRIGHTNESS
 
+_FLUX_COLOR_MODE_TO_HASS_GET = FLUX_COLOR_MODE_TO_HASS.get
+
+CUSTOM_EFFECT_COLORS_EXCEPTIONS: Final = (
+    ValueError,
+    TypeError,
+    SyntaxError,
+    MemoryError,
+    OverflowError,
+)
+
 
 def _hass_color_modes(device: AIOWifiLedBulb) -> set[str]:
     color_modes = device.color_modes
@@ -38,7 +52,25 @@ def _flux_color_mode_to_hass(
         if len(flux_color_modes) > 1:
             return COLOR_MODE_WHITE
         return COLOR_MODE_BRIGHTNESS
-    return FLUX_COLOR_MODE_TO_HASS.get(flux_color_mode, COLOR_MODE_ONOFF)
+    return _FLUX_COLOR_MODE_TO_HASS_GET(flux_color_mode, COLOR_MODE_ONOFF)
+
+
+def _parse_custom_effect_colors(raw_colors: str) -> list[tuple[int, int, int]]:
+    """Parse custom effect colors stored as JSON or entered as a literal.
+
+    Raises one of CUSTOM_EFFECT_COLORS_EXCEPTIONS if invalid.
+    """
+    try:
+        colors = json.loads(raw_colors)
+    except json.JSONDecodeError:
+        # The documented input format [255,0,255],[60,128,0] is not JSON
+        colors = ast.literal_eval(raw_colors)
+    custom_effect_colors = [
+        (int(red), int(green), int(blue)) for red, green, blue in colors
+    ]
+    if any(not 0 <= byte <= 255 for rgb in custom_effect_colors for byte in rgb):
+        raise ValueError("Custom effect colors must be between 0 and 255")
+    return custom_effect_colors
 
 
 def _effect_brightness(brightness: int) -> int: